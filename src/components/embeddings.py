@@ -0,0 +1,319 @@
+import sys
+import hashlib
+import sqlite3
+from pathlib import Path
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from src.logger import logging
+
+# Error text from PyTorch (CUDA/CPU allocators) and ONNX Runtime when an allocation fails.
+OOM_MESSAGES = ("out of memory", "failed to allocate memory")
+
+
+def _is_out_of_memory(error):
+    """Whether ``error`` is an allocation failure that a smaller batch could avoid."""
+    if isinstance(error, MemoryError):
+        return True
+    return isinstance(error, RuntimeError) and any(msg in str(error).lower() for msg in OOM_MESSAGES)
+
+
+class OptimumBackend:
+    """
+    ONNX Runtime inference backend for sentence-transformer models, built on HuggingFace Optimum.
+
+    The model is exported to ONNX once, graph-optimized with ``ORTOptimizer`` and, on CPU,
+    optionally dynamically quantized to INT8 with ``ORTQuantizer`` (AVX512-VNNI kernels).
+    Exported artifacts are kept in ``export_dir`` so later runs skip the export step.
+
+    Attributes:
+        model_name (str): HuggingFace model name to export.
+        export_dir (Path): Directory holding the exported/optimized ONNX files.
+        provider (str): ONNX Runtime execution provider in use.
+        model: The loaded ``ORTModelForFeatureExtraction``.
+        tokenizer: The matching HuggingFace tokenizer.
+    """
+
+    def __init__(self, model_name, export_dir="artifacts/onnx", quantize=True):
+        '''
+        Export (or reuse) and load the optimized ONNX model for ``model_name``.
+        '''
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.export_dir = Path(export_dir) / model_name.replace("/", "__")
+
+        use_cuda = "CUDAExecutionProvider" in onnxruntime.get_available_providers()
+        self.provider = "CUDAExecutionProvider" if use_cuda else "CPUExecutionProvider"
+        # INT8 dynamic quantization only has kernels on the CPU provider.
+        self.quantize = quantize and not use_cuda
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = self._load_model(use_cuda)
+        logging.info("Loaded ONNX model %s with %s", model_name, self.provider)
+
+    def _load_model(self, use_cuda):
+        """
+        Export, optimize and quantize the model, reusing artifacts from ``export_dir`` when present.
+
+        Returns:
+            ORTModelForFeatureExtraction: The loaded ONNX Runtime model.
+        """
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTOptimizer, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoOptimizationConfig, AutoQuantizationConfig
+
+        file_name = "model_optimized_quantized.onnx" if self.quantize else "model_optimized.onnx"
+        if not (self.export_dir / file_name).exists():
+            model = ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True)
+
+            # O4 adds FP16 mixed precision which is only valid on GPU.
+            optimization_config = AutoOptimizationConfig.O4() if use_cuda else AutoOptimizationConfig.O3()
+            optimizer = ORTOptimizer.from_pretrained(model)
+            optimizer.optimize(save_dir=self.export_dir, optimization_config=optimization_config)
+
+            if self.quantize:
+                quantizer = ORTQuantizer.from_pretrained(self.export_dir, file_name="model_optimized.onnx")
+                quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+                quantizer.quantize(save_dir=self.export_dir, quantization_config=quantization_config)
+
+        return ORTModelForFeatureExtraction.from_pretrained(
+            self.export_dir, file_name=file_name, provider=self.provider
+        )
+
+    def encode(self, texts, batch_size=64):
+        """
+        Embed texts with mean pooling over the last hidden state followed by L2 normalization.
+
+        Returns:
+            np.ndarray: A ``(len(texts), dim)`` float32 matrix.
+        """
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            inputs = self.tokenizer(batch, padding=True, truncation=True, return_tensors="np")
+            hidden = self.model(**inputs).last_hidden_state
+
+            mask = inputs["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.append(pooled.astype(np.float32))
+
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+
+class OptimumEmbeddings(Embeddings):
+    """
+    LangChain ``Embeddings`` adapter over :class:`OptimumBackend`, usable anywhere
+    ``HuggingFaceEmbeddings`` is (e.g. ``FAISS.from_documents``).
+    """
+
+    def __init__(self, backend, batch_size=64):
+        self.backend = backend
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts):
+        return self.backend.encode(list(texts), batch_size=self.batch_size).tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class PinnedMemoryEmbeddings(Embeddings):
+    """
+    CUDA encode loop for a LangChain ``HuggingFaceEmbeddings`` model with overlapped host-to-device copies.
+
+    Each tokenized batch is staged in pinned host memory and copied with ``non_blocking=True``,
+    and embeddings stay on the GPU until every batch of the call has been run. The CPU can
+    therefore tokenize the next batch while the GPU is still busy with the previous one, and
+    results come back in a single device-to-host transfer instead of a sync per batch as in
+    ``SentenceTransformer.encode``. Pinning is what makes the copies asynchronous; PyTorch's
+    caching host allocator reuses the pinned blocks from one batch to the next.
+
+    :class:`EmbeddingBatcher` hands all of its packed batches to :meth:`embed_batches` at once,
+    so the overlap also applies behind the batcher.
+
+    Attributes:
+        embeddings: The wrapped ``HuggingFaceEmbeddings`` (used for queries).
+        client: Its underlying ``SentenceTransformer``.
+        batch_size (int): Number of texts per forward pass.
+    """
+
+    def __init__(self, embeddings, batch_size=128):
+        self.embeddings = embeddings
+        self.client = embeddings._client
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        return [vector for vectors in self.embed_batches(batches) for vector in vectors]
+
+    def embed_batches(self, batches):
+        """
+        Embed pre-packed batches of texts, one forward pass each, with a single sync at the end.
+
+        Returns:
+            list: One list of vectors per batch, in the order of ``batches``.
+        """
+        import torch
+
+        batches = [list(batch) for batch in batches]
+        if not batches:
+            return []
+
+        device = self.client.device
+        outputs = []
+        with torch.inference_mode():
+            for batch in batches:
+                features = self.client.tokenize(batch)
+                features = {
+                    key: value.pin_memory().to(device, non_blocking=True) if torch.is_tensor(value) else value
+                    for key, value in features.items()
+                }
+                embeddings = self.client(features)["sentence_embedding"]
+                outputs.append(torch.nn.functional.normalize(embeddings.float(), p=2, dim=1))
+        vectors = torch.cat(outputs).cpu().numpy()
+        return [part.tolist() for part in np.split(vectors, np.cumsum([len(batch) for batch in batches])[:-1])]
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+class EmbeddingBatcher(Embeddings):
+    """
+    LangChain ``Embeddings`` wrapper that packs texts into length-sorted batches and backs off on OOM.
+
+    Texts are sorted by length so each batch pads to similar sizes, then packed greedily
+    until a batch holds ``max_batch`` texts or ``char_cap`` characters. A batch that runs
+    out of memory is split in half and retried, down to single texts as a last resort.
+    Vectors are returned in the original input order. If the wrapped model has an
+    ``embed_batches`` method, all batches are passed to it in one call so it can pipeline
+    them; on OOM the batches are retried one by one.
+
+    Attributes:
+        embeddings (Embeddings): The wrapped embedding model.
+        max_batch (int): Maximum number of texts per batch.
+        char_cap (int): Maximum total characters per batch.
+    """
+
+    def __init__(self, embeddings, max_batch=128, char_cap=150_000):
+        self.embeddings = embeddings
+        self.max_batch = max_batch
+        self.char_cap = char_cap
+
+    def _batches(self, order, texts):
+        """Greedily pack indices (already sorted by length) into batches."""
+        batch, chars = [], 0
+        for i in order:
+            if batch and (len(batch) == self.max_batch or chars + len(texts[i]) > self.char_cap):
+                yield batch
+                batch, chars = [], 0
+            batch.append(i)
+            chars += len(texts[i])
+        if batch:
+            yield batch
+
+    def _encode(self, batch):
+        """Embed a batch, halving it on out-of-memory errors; any other error is raised as is."""
+        try:
+            return self.embeddings.embed_documents(batch)
+        except (RuntimeError, MemoryError) as e:
+            if len(batch) == 1 or not _is_out_of_memory(e):
+                raise
+            logging.warning("Embedding batch of %s failed (%s); retrying in halves.", len(batch), e)
+            if "torch" in sys.modules:
+                sys.modules["torch"].cuda.empty_cache()
+            mid = len(batch) // 2
+            return self._encode(batch[:mid]) + self._encode(batch[mid:])
+
+    def _encode_all(self, batches):
+        """Embed all batches, in a single ``embed_batches`` call when the wrapped model has one."""
+        if len(batches) > 1 and hasattr(self.embeddings, "embed_batches"):
+            try:
+                return self.embeddings.embed_batches(batches)
+            except (RuntimeError, MemoryError) as e:
+                if not _is_out_of_memory(e):
+                    raise
+                logging.warning("Embedding %s batches at once failed (%s); retrying one by one.", len(batches), e)
+                if "torch" in sys.modules:
+                    sys.modules["torch"].cuda.empty_cache()
+        return [self._encode(batch) for batch in batches]
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = list(self._batches(order, texts))
+
+        vectors = [None] * len(texts)
+        for batch, batch_vectors in zip(batches, self._encode_all([[texts[i] for i in batch] for batch in batches])):
+            for i, vector in zip(batch, batch_vectors):
+                vectors[i] = vector
+        return vectors
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain ``Embeddings`` wrapper that caches document vectors in SQLite.
+
+    Vectors are keyed by the SHA1 of the chunk text (scoped by ``namespace``, typically the
+    backend and model name) and stored as float16 to halve disk traffic. On each call only
+    the cache misses are embedded, in a single batched call to the wrapped model.
+
+    Attributes:
+        embeddings (Embeddings): The wrapped embedding model.
+        namespace (str): Cache scope, so different models never share vectors.
+    """
+
+    # Stay below SQLite's default limit on bound parameters per statement.
+    _MAX_PARAMS = 900
+
+    def __init__(self, embeddings, cache_path, namespace=""):
+        self.embeddings = embeddings
+        self.namespace = namespace
+
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(cache_path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "namespace TEXT NOT NULL, hash BLOB NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (namespace, hash))"
+        )
+
+    def _lookup(self, keys):
+        """Fetch cached float16 vectors for ``keys``."""
+        found = {}
+        for start in range(0, len(keys), self._MAX_PARAMS):
+            batch = keys[start:start + self._MAX_PARAMS]
+            rows = self.conn.execute(
+                f"SELECT hash, vector FROM embeddings WHERE namespace = ? AND hash IN ({','.join('?' * len(batch))})",
+                [self.namespace, *batch],
+            )
+            found.update((key, np.frombuffer(vector, dtype=np.float16)) for key, vector in rows)
+        return found
+
+    def embed_documents(self, texts):
+        keys = [hashlib.sha1(text.encode()).digest() for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+
+        misses = {key: text for key, text in zip(keys, texts) if key not in found}
+        if misses:
+            vectors = np.asarray(self.embeddings.embed_documents(list(misses.values())), dtype=np.float16)
+            found.update(zip(misses, vectors))
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (namespace, hash, vector) VALUES (?, ?, ?)",
+                    [(self.namespace, key, vector.tobytes()) for key, vector in zip(misses, vectors)],
+                )
+        logging.info("Embedding cache: %s hits, %s misses", len(texts) - len(misses), len(misses))
+
+        if not keys:
+            return []
+        return np.vstack([found[key] for key in keys]).astype(np.float32).tolist()
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
@@ -1,10 +1,62 @@
+import os
+import re
+import pickle
+import hashlib
+import tempfile
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from langchain_community.document_loaders import PyPDFLoader, DirectoryLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
+import numpy as np
+from src.components.embeddings import (CachedEmbeddings, EmbeddingBatcher, OptimumBackend, OptimumEmbeddings,
+                                       PinnedMemoryEmbeddings)
 from src.logger import logging
 
+try:
+    from semantic_text_splitter import TextSplitter
+except ImportError:  # no wheel for this platform; create_chunks falls back to LangChain
+    TextSplitter = None
+
+# Scalar-quantized alternatives to the product-quantized INDEX_FACTORY ("pq").
+QUANTIZATION_FACTORIES = {
+    "sq8": "SQ8",       # IndexScalarQuantizer QT_8bit, 1 byte per dimension
+    "fp16": "SQfp16",   # IndexScalarQuantizer QT_fp16, 2 bytes per dimension
+    "none": "Flat",     # exact float32 search
+}
+
+
+def _load_one(path, cache_dir=None):
+    """
+    Parse a single PDF into page Documents (top-level so worker processes can pickle it).
+
+    When ``cache_dir`` is set, parsed pages are pickled there under a key derived from
+    the file path, size and mtime, so unchanged files are not parsed again.
+    """
+    from langchain_community.document_loaders import PyPDFLoader
+
+    if cache_dir is None:
+        return PyPDFLoader(str(path)).load()
+
+    stat = os.stat(path)
+    key = hashlib.blake2b(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+    cache_file = Path(cache_dir) / f"{key}.pkl"
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+
+    pages = PyPDFLoader(str(path)).load()
+
+    # Write to a temp file and rename so concurrent workers never see a partial pickle.
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+        pickle.dump(pages, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f.name, cache_file)
+    return pages
+
+
 class PDFVectorStore:
     """
     A pipeline for processing PDF documents, generating text embeddings, 
@@ -16,6 +68,10 @@ class PDFVectorStore:
         3. Generate embeddings using a HuggingFace transformer model.
         4. Store and persist embeddings in a FAISS vector store.
 
+    Embeddings are L2-normalized and searched by inner product, so similarity scores
+    are (approximate, for compressed indexes) cosine similarities where higher is more
+    similar, not squared L2 distances.
+
     Attributes:
         data_path (str): Directory path containing PDF files.
         db_faiss_path (str): Directory path to save FAISS vector database.
@@ -24,20 +80,52 @@ class PDFVectorStore:
         model_name (str): HuggingFace model name used for embeddings.
     """
 
+    # Number of recent chunk vectors kept to skip re-embedding repeated text across batches.
+    DEDUP_CACHE_SIZE = 100_000
+
     def __init__(self):
         '''
         Initialize the PDFVectorStore pipeline with configuration values.
         '''
 
-    def load_pdfs(self, data):
+    def _iter_pdfs(self, data, cache_dir=None, max_workers=None):
+        """
+        Yield the pages of each PDF in sorted file order, parsing ahead in a process pool.
+
+        At most ``2 * max_workers`` files are in flight, so only a bounded window of
+        parsed files is held in memory rather than the whole corpus. Workers are spawned
+        rather than forked, since by then the embedding model may already have started
+        CUDA and OpenMP threads, which are unsafe to fork.
+        """
+        pdf_paths = sorted(Path(data).glob("*.pdf"))
+        max_workers = max_workers or os.cpu_count()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        load = partial(_load_one, cache_dir=cache_dir)
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            pending = deque()
+            for path in pdf_paths:
+                pending.append(executor.submit(load, path))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def load_pdfs(self, data, cache_dir=None, max_workers=None):
         """
         Load all PDF files from the configured directory.
 
+        Files are parsed in parallel across ``max_workers`` processes
+        (defaults to the number of CPUs); page order follows the sorted file names.
+        If ``cache_dir`` is given, parsed pages are cached there and reused while
+        the PDF's size and modification time are unchanged.
+
         Returns:
             list: A list of Document objects extracted from PDF files.
         """
-        loader = DirectoryLoader(data, glob="*.pdf", loader_cls=PyPDFLoader)
-        documents = loader.load()
+        documents = [page for pages in self._iter_pdfs(data, cache_dir, max_workers) for page in pages]
 
         logging.info("Length of PDF pages: %s", len(documents))
         return documents
@@ -46,66 +134,438 @@ class PDFVectorStore:
         """
         Split extracted documents into smaller overlapping chunks.
 
+        Uses the Rust-backed ``semantic_text_splitter`` and falls back to LangChain's
+        ``RecursiveCharacterTextSplitter`` where it cannot be imported. Each chunk keeps
+        the metadata of the page it came from.
+
         Returns:
             list: A list of chunked Document objects.
         """
         if not extracted_data:
             raise ValueError("No documents found. Run load_pdfs() first.")
-        
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
-        text_chunks = text_splitter.split_documents(extracted_data)
+
+        if TextSplitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+            return text_splitter.split_documents(extracted_data)
+
+        from langchain_core.documents import Document
+
+        text_splitter = TextSplitter(capacity=chunk_size, overlap=chunk_overlap)
+        text_chunks = [
+            Document(page_content=chunk, metadata=dict(doc.metadata))
+            for doc in extracted_data
+            for chunk in text_splitter.chunks(doc.page_content)
+        ]
         return text_chunks
 
-    def load_embedding_model(self, model_name):
+    def _optimize_transformer(self, embedding_model):
+        """
+        Swap in BetterTransformer fused attention and compile the encoder with ``torch.compile``.
+
+        Both steps are best effort: a warm-up encode checks the result, and models or
+        library versions that do not support them keep the eager PyTorch module.
+        """
+        import torch
+
+        client = embedding_model._client
+        transformer = client[0]
+
+        try:
+            from optimum.bettertransformer import BetterTransformer
+            transformer.auto_model = BetterTransformer.transform(transformer.auto_model)
+        except Exception as e:
+            logging.warning("BetterTransformer not applied: %s", e)
+
+        eager_model = transformer.auto_model
+        try:
+            mode = "reduce-overhead" if client.device.type == "cuda" else None
+            transformer.auto_model = torch.compile(eager_model, mode=mode, dynamic=True)
+            client.encode(["warm-up"])  # torch.compile is lazy; surface failures here
+            logging.info("Compiled embedding model with torch.compile (mode=%s)", mode)
+        except Exception as e:
+            transformer.auto_model = eager_model
+            logging.warning("torch.compile not applied: %s", e)
+
+    def load_embedding_model(self, model_name, batch_size=128, backend="torch", cache_path=None,
+                             char_cap=150_000, compile_model=False):
         """
         Load a HuggingFace transformer embedding model.
 
+        With ``backend="torch"`` the model is placed on the GPU in FP16 when CUDA is
+        available and encodes chunks in batches of ``batch_size`` instead of one by one,
+        staging inputs in pinned memory on CUDA; ``compile_model`` additionally applies
+        BetterTransformer and ``torch.compile``.
+        With ``backend="onnx"`` the model is exported to ONNX Runtime via Optimum
+        (requires ``optimum[onnxruntime]``). If ``cache_path`` is given, chunk
+        embeddings are cached in that SQLite file and only new chunks are embedded.
+
+        Chunks are packed into length-sorted batches of at most ``batch_size`` texts
+        and ``char_cap`` characters, which are split in half on out-of-memory errors.
+
         Returns:
-            HuggingFaceEmbeddings: The initialized embedding model.
+            Embeddings: The initialized embedding model.
         """
-        embedding_model = HuggingFaceEmbeddings(model_name=model_name)
+        if backend == "onnx":
+            embedding_model = OptimumEmbeddings(OptimumBackend(model_name), batch_size=min(batch_size, 64))
+        elif backend == "torch":
+            import torch
+            from langchain_huggingface import HuggingFaceEmbeddings
+
+            if torch.cuda.is_available():
+                model_kwargs = {"device": "cuda", "model_kwargs": {"torch_dtype": torch.float16}}
+            else:
+                # FP16 matmuls are slower than FP32 on most CPUs, keep the default dtype.
+                model_kwargs = {"device": "cpu"}
+
+            embedding_model = HuggingFaceEmbeddings(
+                model_name=model_name,
+                model_kwargs=model_kwargs,
+                encode_kwargs={
+                    "batch_size": batch_size,
+                    "normalize_embeddings": True,
+                    "convert_to_numpy": True,
+                },
+                show_progress=False,
+            )
+            logging.info("Loaded embedding model %s on %s (batch_size=%s)",
+                         model_name, model_kwargs["device"], batch_size)
+            if compile_model:
+                self._optimize_transformer(embedding_model)
+            if model_kwargs["device"] == "cuda":
+                embedding_model = PinnedMemoryEmbeddings(embedding_model, batch_size=batch_size)
+        else:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+
+        embedding_model = EmbeddingBatcher(embedding_model, max_batch=batch_size, char_cap=char_cap)
+        if cache_path is not None:
+            embedding_model = CachedEmbeddings(embedding_model, cache_path, namespace=f"{backend}:{model_name}")
         return embedding_model
 
-    def build_faiss_index(self, text_chunks, embedding_model, db_faiss_path):
+    def _resolve_index_factory(self, quantization, index_factory):
+        """
+        Map a quantization setting to a FAISS factory string; ``"pq"`` keeps ``index_factory``.
+
+        Returns:
+            str: The factory string to build.
+        """
+        if quantization == "pq":
+            return index_factory
+        if quantization not in QUANTIZATION_FACTORIES:
+            raise ValueError(f"Unknown quantization: {quantization}")
+        return QUANTIZATION_FACTORIES[quantization]
+
+    def _min_training_points(self, index_factory):
+        """
+        Number of vectors needed to train ``index_factory`` (about 39 per IVF/PQ centroid).
+
+        Returns:
+            int: Minimum training set size, 0 for indexes that need no training.
+        """
+        ivf = re.search(r"IVF(\d+)", index_factory)
+        centroids = max(int(ivf.group(1)) if ivf else 0, 256 if "PQ" in index_factory else 0)
+        return 39 * centroids
+
+    def _create_index(self, X, index_factory, nprobe):
+        """
+        Create, train and fill a FAISS index from a factory string using inner-product search.
+
+        Corpora too small to train ``index_factory`` fall back to an exact flat index,
+        which is faster at that scale anyway. The index is wrapped in an ``IndexIDMap``
+        so further batches can be added incrementally with explicit ids.
+
+        Returns:
+            faiss.IndexIDMap: The trained FAISS index holding ``X`` under ids ``0..len(X)-1``.
+        """
+        import faiss
+
+        if len(X) < self._min_training_points(index_factory):
+            logging.info("Only %s vectors, too few to train %s; using a flat index.",
+                         len(X), index_factory)
+            index_factory = "Flat"
+
+        index = faiss.index_factory(X.shape[1], index_factory, faiss.METRIC_INNER_PRODUCT)
+        if "IVF" in index_factory:
+            faiss.extract_index_ivf(index).nprobe = nprobe
+        index.train(X)
+        logging.info("Created FAISS index %s (dim=%s)", index_factory, X.shape[1])
+
+        index = faiss.IndexIDMap(index)
+        index.add_with_ids(X, np.arange(len(X), dtype=np.int64))
+        return index
+
+    def _embed_matrix(self, text_chunks, embedding_model, seen=None):
+        """
+        Embed chunks into one contiguous, L2-normalized float32 matrix.
+
+        Chunks with identical text (repeated headers, footers, references) are embedded
+        once and their vector is copied to every duplicate's row. ``seen`` maps text
+        hashes to vectors across calls, so repeats in later batches are reused too; it
+        is kept to the ``DEDUP_CACHE_SIZE`` most recently seen texts.
+
+        With unit-length vectors the inner product used by the index equals cosine
+        similarity, so no per-distance square root is needed. Normalizing here keeps
+        that true even for backends that do not normalize themselves.
+
+        Returns:
+            np.ndarray: A ``(len(text_chunks), dim)`` matrix.
+        """
+        import faiss
+
+        seen = OrderedDict() if seen is None else seen
+        keys = []
+        new = {}
+        for chunk in text_chunks:
+            key = hashlib.sha1(chunk.page_content.encode()).digest()
+            keys.append(key)
+            if key in seen:
+                seen.move_to_end(key)
+            elif key not in new:
+                new[key] = chunk.page_content
+
+        if len(new) < len(text_chunks):
+            logging.info("Embedding %s unique of %s chunks.", len(new), len(text_chunks))
+        if new:
+            vectors = np.ascontiguousarray(embedding_model.embed_documents(list(new.values())), dtype=np.float32)
+            faiss.normalize_L2(vectors)
+            seen.update((key, vector.copy()) for key, vector in zip(new, vectors))
+
+        X = np.ascontiguousarray(np.stack([seen[key] for key in keys]))
+        while len(seen) > self.DEDUP_CACHE_SIZE:
+            seen.popitem(last=False)
+        return X
+
+    def _wrap_store(self, index, docs, embedding_model):
+        """
+        Wrap a raw FAISS index and its chunks (keyed by string position ids) in LangChain's FAISS.
+
+        Returns:
+            FAISS: The FAISS vector store.
+        """
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+
+        return FAISS(
+            embedding_function=embedding_model,
+            index=index,
+            docstore=InMemoryDocstore(docs),
+            index_to_docstore_id={i: str(i) for i in range(len(docs))},
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        )
+
+    def _index_batches(self, batches, embedding_model, db_faiss_path, index_factory, nprobe,
+                       checkpoint_every=None, index=None, docs=None):
+        """
+        Embed and index an iterable of chunk batches, then save the vector store.
+
+        Vectors are buffered only until there are enough to train ``index_factory``;
+        after that each batch is embedded and added straight away. With
+        ``checkpoint_every`` the store is also saved after every that many batches.
+        Passing an existing ``index`` and its ``docs`` continues from a checkpoint.
+
+        Returns:
+            FAISS: The initialized FAISS vector store.
+        """
+        train_size = self._min_training_points(index_factory)
+        docs = dict(docs or {})
+        pending = []
+        seen = OrderedDict()
+
+        for n, batch in enumerate(batches, start=1):
+            X = self._embed_matrix(batch, embedding_model, seen)
+            start = len(docs)
+            docs.update((str(start + i), chunk) for i, chunk in enumerate(batch))
+
+            if index is not None:
+                index.add_with_ids(X, np.arange(start, start + len(X), dtype=np.int64))
+            else:
+                pending.append(X)
+                if len(docs) < train_size:
+                    continue
+                index = self._create_index(np.vstack(pending), index_factory, nprobe)
+                pending = []
+
+            if checkpoint_every and n % checkpoint_every == 0:
+                self._save_index(self._wrap_store(index, docs, embedding_model), db_faiss_path)
+
+        if index is None:
+            if not pending:
+                raise ValueError("No text chunks found. Run create_chunks() first.")
+            index = self._create_index(np.vstack(pending), index_factory, nprobe)
+
+        db = self._wrap_store(index, docs, embedding_model)
+        self._save_index(db, db_faiss_path)
+        return db
+
+    def _load_checkpoint(self, db_faiss_path):
+        """
+        Load a previously saved index and its chunks for resuming.
+
+        A checkpoint whose index and docstore disagree on the number of vectors (e.g. a
+        crash between writing the two files) is discarded.
+
+        Returns:
+            tuple: ``(index, docs)``, or ``(None, {})`` when there is no usable checkpoint.
+        """
+        import faiss
+
+        path = Path(db_faiss_path)
+        if not (path / "index.faiss").exists() or not (path / "index.pkl").exists():
+            return None, {}
+
+        with open(path / "index.pkl", "rb") as f:
+            docstore, _ = pickle.load(f)
+        docs = docstore._dict
+        index = faiss.read_index(str(path / "index.faiss"))
+        if index.ntotal != len(docs):
+            logging.warning("Checkpoint at %s has %s vectors but %s chunks; rebuilding.",
+                            db_faiss_path, index.ntotal, len(docs))
+            return None, {}
+        return index, docs
+
+    def _matches_checkpoint(self, docs, chunks):
+        """Check that ``chunks`` are exactly the chunks already indexed in ``docs``, in order."""
+        return len(chunks) == len(docs) and all(
+            docs[str(i)].page_content == chunk.page_content for i, chunk in enumerate(chunks)
+        )
+
+    def _save_index(self, db, db_faiss_path):
+        """
+        Persist the raw FAISS index in its native format and pickle only the small docstore mapping.
+
+        The layout (``index.faiss`` + ``index.pkl``) matches ``FAISS.save_local``, so
+        ``FAISS.load_local`` can still read it. Both files are written to temporary names
+        and renamed into place, so a crash never leaves a truncated file.
+        """
+        import faiss
+
+        path = Path(db_faiss_path)
+        path.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(db.index, str(path / "index.faiss.tmp"))
+        with open(path / "index.pkl.tmp", "wb") as f:
+            pickle.dump((db.docstore, db.index_to_docstore_id), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path / "index.faiss.tmp", path / "index.faiss")
+        os.replace(path / "index.pkl.tmp", path / "index.pkl")
+        logging.info("Saved FAISS index with %s vectors to %s", db.index.ntotal, db_faiss_path)
+
+    @classmethod
+    def load_index(cls, db_faiss_path, embedding_model):
+        """
+        Load a saved vector store, memory-mapping the FAISS index read-only.
+
+        Startup does not read the index into RAM and the pages are shared between
+        processes. Index types that cannot be memory-mapped are read normally.
+
+        Returns:
+            FAISS: The loaded FAISS vector store.
+        """
+        import faiss
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+
+        path = Path(db_faiss_path)
+        try:
+            index = faiss.read_index(str(path / "index.faiss"), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as e:
+            logging.warning("Could not memory-map FAISS index (%s); reading it into memory.", e)
+            index = faiss.read_index(str(path / "index.faiss"))
+
+        with open(path / "index.pkl", "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        return FAISS(
+            embedding_function=embedding_model,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        )
+
+    def build_faiss_index(self, text_chunks, embedding_model, db_faiss_path,
+                          index_factory="OPQ32,IVF256,PQ32", nprobe=16, quantization="pq",
+                          group_size=2048, checkpoint_every=10, resume=False):
         """
         Build a FAISS vector store from text chunks and embeddings.
 
+        Chunks are embedded and added in groups of ``group_size``, so only one group of
+        embeddings is in memory at a time, and the store is checkpointed to
+        ``db_faiss_path`` every ``checkpoint_every`` groups. With ``resume=True`` a
+        matching checkpoint is loaded and only the remaining chunks are embedded.
+
+        The index is a compressed ``index_factory`` index (IVF-PQ by default) rather
+        than a flat one. Search recall can be traded for speed with ``nprobe``.
+        ``quantization`` selects ``"pq"`` (``index_factory``), ``"sq8"``, ``"fp16"``
+        or ``"none"`` (flat float32).
+
         Returns:
             FAISS: The initialized FAISS vector store.
         """
         if not text_chunks:
             raise ValueError("No text chunks found. Run create_chunks() first.")
         if not embedding_model:
-            self.load_embedding_model()
+            raise ValueError("No embedding model found. Run load_embedding_model() first.")
 
-        db = FAISS.from_documents(text_chunks, embedding_model)
+        index_factory = self._resolve_index_factory(quantization, index_factory)
+        index, docs = self._load_checkpoint(db_faiss_path) if resume else (None, {})
+        if docs:
+            if self._matches_checkpoint(docs, text_chunks[:len(docs)]):
+                logging.info("Resuming from checkpoint with %s of %s chunks indexed.", len(docs), len(text_chunks))
+            else:
+                logging.warning("Checkpoint at %s does not match the current chunks; rebuilding.", db_faiss_path)
+                index, docs = None, {}
 
-        if not db:
-            raise ValueError("No FAISS index found. Run build_faiss_index() first.")
-        db.save_local(str(db_faiss_path))
-        return db
-        
+        groups = (text_chunks[i:i + group_size] for i in range(len(docs), len(text_chunks), group_size))
+        return self._index_batches(groups, embedding_model, db_faiss_path, index_factory, nprobe,
+                                   checkpoint_every=checkpoint_every, index=index, docs=docs)
+
+    def _iter_chunks(self, data, cache_dir, chunk_size, chunk_overlap):
+        """Yield chunks one by one, chunking each PDF as soon as it is parsed."""
+        for pages in self._iter_pdfs(data, cache_dir):
+            if pages:
+                yield from self.create_chunks(pages, chunk_size, chunk_overlap)
+
+    def run_pipeline(self, data, embedding_model, db_faiss_path, chunk_size, chunk_overlap,
+                     group_size=2048, cache_dir=None, index_factory="OPQ32,IVF256,PQ32", nprobe=16,
+                     quantization="pq", checkpoint_every=10, resume=False):
+        """
+        Execute the full pipeline as a stream: load PDFs → chunk → embed → build & save FAISS index.
+
+        Each PDF is chunked as soon as it is parsed and chunks are embedded in groups of
+        ``group_size``, so the full list of pages and chunks is never materialized. A group
+        spans many model batches, which the embedding model can pipeline on the GPU.
+        The store is checkpointed every ``checkpoint_every`` groups; with ``resume=True``
+        chunks already in a matching checkpoint are re-chunked but not embedded again.
+        Index options are as in :meth:`build_faiss_index`.
+
+        Returns:
+            FAISS: The built FAISS vector store.
+        """
+        index_factory = self._resolve_index_factory(quantization, index_factory)
+        chunks = self._iter_chunks(data, cache_dir, chunk_size, chunk_overlap)
 
-    # def run_pipeline(self):
-    #     """
-    #     Execute the full pipeline: load PDFs → chunk → embed → build & save FAISS index.
+        index, docs = self._load_checkpoint(db_faiss_path) if resume else (None, {})
+        if docs:
+            indexed = list(islice(chunks, len(docs)))
+            if self._matches_checkpoint(docs, indexed):
+                logging.info("Resuming from checkpoint with %s chunks indexed.", len(docs))
+            else:
+                logging.warning("Checkpoint at %s does not match the current chunks; rebuilding.", db_faiss_path)
+                index, docs = None, {}
+                chunks = chain(indexed, chunks)
 
-    #     Returns:
-    #         FAISS: The built FAISS vector store.
-    #     """
-    #     self.load_pdfs()
-    #     self.create_chunks()
-    #     self.load_embedding_model()
-    #     self.build_faiss_index()
-    #     self.save_index()
-    #     return db
+        groups = iter(lambda: list(islice(chunks, group_size)), [])
+        return self._index_batches(groups, embedding_model, db_faiss_path, index_factory, nprobe,
+                                   checkpoint_every=checkpoint_every, index=index, docs=docs)
 
 
 # if __name__ == "__main__":
 #     # Example usage
-#     pdf_pipeline = PDFVectorStore(data_path="data/", db_faiss_path="vectorstore/db_faiss")
-#     db = pdf_pipeline.run_pipeline()
-#     print("✅ FAISS index created and saved at:", pdf_pipeline.db_faiss_path)
+#     pdf_pipeline = PDFVectorStore()
+#     model = pdf_pipeline.load_embedding_model("sentence-transformers/all-MiniLM-L6-v2")
+#     db = pdf_pipeline.run_pipeline("data/", model, "vectorstore/db_faiss", chunk_size=500, chunk_overlap=50)
+#     print("✅ FAISS index created and saved at: vectorstore/db_faiss")
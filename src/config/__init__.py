@@ -1,6 +1,8 @@
 from box import Box
 import json
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 def load_config(path: Path = Path("config.json")) -> Box:
     """
@@ -43,3 +45,36 @@ PARMS = load_constants()
 
 # Global config object
 CONFIG = load_config()
+
+
+@dataclass(frozen=True, slots=True)
+class MemoConfig:
+    """
+    Resolved settings for the vector DB stage, merged from ``CONFIG FOR MEMO``
+    (config.json) and ``PARMS FOR MEMO`` (parms.json) with keys lower-cased.
+
+    Built once at import time, so a missing required key or a misspelled
+    key fails at startup instead of surfacing later as ``None``.
+    """
+    data_path: str
+    db_faiss_path: str
+    model_name: str
+    chunk_size: int
+    chunk_overlap: int
+    pdf_cache_dir: Optional[str] = None
+    embedding_cache: Optional[str] = None
+    batch_size: int = 128
+    backend: str = "torch"
+    char_cap: int = 150_000
+    compile: bool = False
+    index_factory: str = "OPQ32,IVF256,PQ32"
+    nprobe: int = 16
+    quantization: str = "pq"
+    checkpoint_every: int = 10
+    resume: bool = False
+
+
+MEMO_CFG = MemoConfig(**{
+    key.lower(): value
+    for key, value in {**CONFIG["CONFIG FOR MEMO"], **PARMS["PARMS FOR MEMO"]}.items()
+})
@@ -26,8 +26,9 @@ def configure_logger():
     # Define formatter
     formatter = logging.Formatter("[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s")
 
-    # File handler with rotation
-    file_handler = RotatingFileHandler(log_file_path, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
+    # File handler with rotation; opened on the first record so worker processes that
+    # never log do not leave empty log files behind
+    file_handler = RotatingFileHandler(log_file_path, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT, delay=True)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
     
@@ -1,6 +1,5 @@
 import sys
-from src.config import CONFIG, PARMS
-from src.components.memory_for_llm import PDFVectorStore
+from src.config import MEMO_CFG
 from src.exception import MyException
 
 class Vector_DB_Pipeline:
@@ -9,23 +8,21 @@ class Vector_DB_Pipeline:
 
     @staticmethod
     def main():
-        config = CONFIG.get("CONFIG FOR MEMO", {})
+        # Imported here so that importing this module (e.g. from train.py) stays cheap.
+        from src.components.memory_for_llm import PDFVectorStore
 
-        data = config.get("DATA_PATH")
-        db_faiss_path = config.get("DB_FAISS_PATH")
-        model_name = config.get("MODEL_NAME")
+        cfg = MEMO_CFG
 
-        parms = PARMS.get("PARMS FOR MEMO", {})
-
-        chunk_size = parms.get('CHUNK_SIZE')
-        chunk_overlap = parms.get("CHUNK_OVERLAP")
-
-        
         vector_store = PDFVectorStore()
-        extracted_data = vector_store.load_pdfs(data=data)
-        text_chunk = vector_store.create_chunks(extracted_data=extracted_data, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        model = vector_store.load_embedding_model(model_name=model_name)
-        vector_store.build_faiss_index(text_chunks=text_chunk, embedding_model=model, db_faiss_path=db_faiss_path)
+        model = vector_store.load_embedding_model(model_name=cfg.model_name, batch_size=cfg.batch_size,
+                                                  backend=cfg.backend, cache_path=cfg.embedding_cache,
+                                                  char_cap=cfg.char_cap, compile_model=cfg.compile)
+        vector_store.run_pipeline(data=cfg.data_path, embedding_model=model, db_faiss_path=cfg.db_faiss_path,
+                                  chunk_size=cfg.chunk_size, chunk_overlap=cfg.chunk_overlap,
+                                  cache_dir=cfg.pdf_cache_dir,
+                                  index_factory=cfg.index_factory, nprobe=cfg.nprobe,
+                                  quantization=cfg.quantization, checkpoint_every=cfg.checkpoint_every,
+                                  resume=cfg.resume)
 
 
 if __name__ == '__main__':